@@ -1,17 +1,23 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
+from collections import deque
+from itertools import islice
 from pathlib import Path
 
+import orjson
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from sse_starlette.sse import EventSourceResponse
 
+from api import cache
+from api.orjson_response import ORJSONResponse
 from api.routers import posts, scraper_control, sources, trends
+from config.settings import settings
+from data.database import count_statements, enable_statement_counting
 
 log = logging.getLogger(__name__)
 
@@ -20,33 +26,74 @@ DASHBOARD_DIR = BASE_DIR / "dashboard"
 
 
 class Broadcaster:
-    """Simple in-memory SSE broadcaster."""
+    """In-memory SSE broadcaster backed by a shared ring buffer.
 
-    def __init__(self) -> None:
-        self._listeners: list[asyncio.Queue] = []
+    Each message is encoded and stored once. Subscribers hold a sequence
+    cursor and read whatever arrived after it; anyone who falls more than
+    ``history`` messages behind skips the oldest ones.
+    """
 
-    async def broadcast(self, data: dict) -> None:
-        for q in list(self._listeners):
-            try:
-                q.put_nowait(data)
-            except asyncio.QueueFull:
-                pass
-
-    def subscribe(self) -> asyncio.Queue:
-        q: asyncio.Queue = asyncio.Queue(maxsize=50)
-        self._listeners.append(q)
-        return q
+    def __init__(self, history: int = 256) -> None:
+        self._ring: deque[str] = deque(maxlen=history)
+        self._seq = 0
+        self._wakeup = asyncio.Event()
 
-    def unsubscribe(self, q: asyncio.Queue) -> None:
-        if q in self._listeners:
-            self._listeners.remove(q)
+    async def broadcast(self, data: dict) -> None:
+        # Broadcasts follow new data, so cached aggregates are now stale
+        cache.invalidate()
+        self._ring.append(orjson.dumps(data).decode())
+        self._seq += 1
+        # Wake everyone parked on the current event and hand out a fresh one
+        wakeup, self._wakeup = self._wakeup, asyncio.Event()
+        wakeup.set()
+
+    def subscribe(self) -> int:
+        """Return a cursor positioned after the latest message."""
+        return self._seq
+
+    async def receive(self, cursor: int) -> tuple[int, list[str]]:
+        """Wait for messages newer than *cursor*; return the new cursor and them."""
+        while cursor == self._seq:
+            await self._wakeup.wait()
+        pending = min(self._seq - cursor, len(self._ring))
+        return self._seq, list(islice(self._ring, len(self._ring) - pending, None))
+
+
+def _install_query_counter(app: FastAPI) -> None:
+    """Log per-request SQL statement counts to catch N+1 regressions."""
+    enable_statement_counting()
+
+    @app.middleware("http")
+    async def query_counter(request: Request, call_next):
+        with count_statements() as counter:
+            response = await call_next(request)
+        level = (
+            logging.WARNING
+            if counter[0] > settings.DEBUG_QUERY_WARN_THRESHOLD
+            else logging.DEBUG
+        )
+        log.log(
+            level,
+            "%s %s ran %d SQL statements",
+            request.method,
+            request.url.path,
+            counter[0],
+        )
+        return response
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="Social Dashboard", version="0.1.0")
+    app = FastAPI(
+        title="Social Dashboard",
+        version="0.1.0",
+        default_response_class=ORJSONResponse,
+    )
     broadcaster = Broadcaster()
     app.state.broadcaster = broadcaster
 
+    if settings.LOG_LEVEL == "DEBUG":
+        _install_query_counter(app)
+
     # Mount static files
     app.mount(
         "/static",
@@ -63,23 +110,23 @@ def create_app() -> FastAPI:
 
     # SSE endpoint
     @app.get("/api/events")
-    async def sse_events(request: Request):
-        q = broadcaster.subscribe()
+    async def sse_events():
+        cursor = broadcaster.subscribe()
 
+        # EventSourceResponse watches the receive channel itself and cancels
+        # this generator as soon as the client disconnects, so the loop only
+        # has to wait for data.
         async def event_generator():
-            try:
-                while True:
-                    if await request.is_disconnected():
-                        break
-                    try:
-                        data = await asyncio.wait_for(q.get(), timeout=30.0)
-                        yield {"event": "message", "data": json.dumps(data)}
-                    except asyncio.TimeoutError:
-                        yield {"event": "ping", "data": ""}
-                    except Exception:
-                        break
-            finally:
-                broadcaster.unsubscribe(q)
+            nonlocal cursor
+            while True:
+                try:
+                    async with asyncio.timeout(30.0):
+                        cursor, batch = await broadcaster.receive(cursor)
+                except TimeoutError:
+                    yield {"event": "ping", "data": ""}
+                    continue
+                for data in batch:
+                    yield {"event": "message", "data": data}
 
         return EventSourceResponse(event_generator())
 
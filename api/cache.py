@@ -0,0 +1,109 @@
+"""Short-lived in-process cache for aggregate API responses."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi.responses import Response
+
+from api.orjson_response import ORJSONResponse
+from config.settings import settings
+
+log = logging.getLogger(__name__)
+
+# Bumped whenever new data lands; entries from an older generation are
+# never served, stale or not.
+_generation = 0
+# key -> (fresh until, servable until, generation, body)
+_entries: dict[tuple, tuple[float, float, int, bytes]] = {}
+_refreshing: set[tuple] = set()
+_background: set[asyncio.Task] = set()
+
+
+def invalidate() -> None:
+    """Mark every cached response as out of date."""
+    global _generation
+    _generation += 1
+    _entries.clear()
+    _refreshing.clear()
+
+
+def _store(key: tuple, entry: tuple[float, float, int, bytes]) -> None:
+    # Evict whatever can no longer be served, so the dict only ever holds
+    # keys that were requested within the last ttl + stale seconds
+    now = time.monotonic()
+    for k in [k for k, e in _entries.items() if e[1] <= now]:
+        del _entries[k]
+    _entries[key] = entry
+
+
+def _json(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+
+def ttl_cache_bytes(
+    ttl: float = settings.API_CACHE_TTL_SECONDS,
+    stale: float = settings.API_CACHE_STALE_SECONDS,
+    cache_if: Callable[..., bool] | None = None,
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Response]]]:
+    """Cache an endpoint's serialised JSON body for ``ttl`` seconds.
+
+    For a further ``stale`` seconds the expired body is still served while a
+    single background call refreshes it.  Endpoint arguments form the key;
+    calls for which ``cache_if(**kwargs)`` is false bypass the cache.
+    """
+
+    def decorator(
+        fn: Callable[..., Awaitable[Any]],
+    ) -> Callable[..., Awaitable[Response]]:
+        async def render(kwargs: dict[str, Any]) -> bytes:
+            result = await fn(**kwargs)
+            if isinstance(result, Response):
+                return bytes(result.body)
+            return ORJSONResponse(result).body
+
+        async def refresh(key: tuple, kwargs: dict[str, Any]) -> bytes:
+            generation = _generation
+            body = await render(kwargs)
+            # Data that landed mid-query has already invalidated this body
+            if generation == _generation:
+                expires = time.monotonic() + ttl
+                _store(key, (expires, expires + stale, generation, body))
+            return body
+
+        async def refresh_in_background(key: tuple, kwargs: dict[str, Any]) -> None:
+            try:
+                await refresh(key, kwargs)
+            except Exception:
+                log.exception("Background refresh of %s failed", fn.__qualname__)
+            finally:
+                _refreshing.discard(key)
+
+        @functools.wraps(fn)
+        async def wrapper(**kwargs: Any) -> Response:
+            if cache_if is not None and not cache_if(**kwargs):
+                return _json(await render(kwargs))
+            key = (fn.__module__, fn.__qualname__, *sorted(kwargs.items()))
+            entry = _entries.get(key)
+            if entry is not None and entry[2] == _generation:
+                expires, stale_until, _, body = entry
+                now = time.monotonic()
+                if now < expires:
+                    return _json(body)
+                if now < stale_until:
+                    if key not in _refreshing:
+                        _refreshing.add(key)
+                        task = asyncio.create_task(refresh_in_background(key, kwargs))
+                        _background.add(task)
+                        task.add_done_callback(_background.discard)
+                    return _json(body)
+            return _json(await refresh(key, kwargs))
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi.responses import Response
+
+
+class ORJSONResponse(Response):
+    """JSON response rendered with orjson.
+
+    SQLite hands back naive datetimes that are UTC by convention, so they are
+    serialised with an explicit ``Z`` suffix.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+        )
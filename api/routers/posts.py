@@ -4,31 +4,14 @@ from datetime import datetime
 
 from fastapi import APIRouter, Query
 
+from api.cache import ttl_cache_bytes
+from api.orjson_response import ORJSONResponse
 from data.database import get_session
 from data.repositories import PostRepository
 
 router = APIRouter(prefix="/api/posts", tags=["posts"])
 
 
-def _post_to_dict(p) -> dict:
-    return {
-        "id": p.id,
-        "source": p.source,
-        "source_id": p.source_id,
-        "source_url": p.source_url,
-        "author": p.author,
-        "title": p.title,
-        "body": p.body[:300],
-        "subreddit": p.subreddit,
-        "category": p.category,
-        "score": p.score,
-        "num_comments": p.num_comments,
-        "engagement_score": p.engagement_score,
-        "published_at": p.published_at.isoformat() if p.published_at else None,
-        "scraped_at": p.scraped_at.isoformat() if p.scraped_at else None,
-    }
-
-
 @router.get("")
 async def list_posts(
     source: str | None = None,
@@ -52,10 +35,11 @@ async def list_posts(
             offset=offset,
             since=since,
         )
-        return [_post_to_dict(p) for p in posts]
+        return ORJSONResponse([dict(p) for p in posts])
 
 
 @router.get("/stats")
+@ttl_cache_bytes()
 async def post_stats():
     async with get_session() as session:
         repo = PostRepository(session)
@@ -66,4 +50,4 @@ async def post_stats():
 async def hourly_activity(hours: int = Query(24, ge=1, le=168)):
     async with get_session() as session:
         repo = PostRepository(session)
-        return await repo.get_hourly_activity(hours)
+        return ORJSONResponse(await repo.get_hourly_activity(hours))
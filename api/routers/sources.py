@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Query
 
+from api.cache import ttl_cache_bytes
+from api.orjson_response import ORJSONResponse
 from data.database import get_session
 from data.repositories import ScrapeLogRepository
 
@@ -9,6 +11,7 @@ router = APIRouter(prefix="/api/sources", tags=["sources"])
 
 
 @router.get("/stats")
+@ttl_cache_bytes()
 async def source_stats():
     async with get_session() as session:
         repo = ScrapeLogRepository(session)
@@ -20,17 +23,4 @@ async def recent_runs(limit: int = Query(20, ge=1, le=100)):
     async with get_session() as session:
         repo = ScrapeLogRepository(session)
         runs = await repo.recent_runs(limit=limit)
-        return [
-            {
-                "id": r.id,
-                "source": r.source,
-                "status": r.status,
-                "items_scraped": r.items_scraped,
-                "items_new": r.items_new,
-                "error_message": r.error_message,
-                "duration_seconds": r.duration_seconds,
-                "started_at": r.started_at.isoformat() if r.started_at else None,
-                "finished_at": r.finished_at.isoformat() if r.finished_at else None,
-            }
-            for r in runs
-        ]
+        return ORJSONResponse([dict(r) for r in runs])
@@ -6,16 +6,21 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./social_dashboard.db"
+    DB_POOL_SIZE: int = 20
 
     # Server
     DASHBOARD_PORT: int = 8001
     LOG_LEVEL: str = "INFO"
+    # With LOG_LEVEL=DEBUG, warn when a request runs more statements than this
+    DEBUG_QUERY_WARN_THRESHOLD: int = 10
 
     # Reddit
     REDDIT_SUBREDDITS: str = "technology,worldnews,science,programming,stocks,wallstreetbets,cryptocurrency,economics"
     REDDIT_SORT: str = "hot"
     REDDIT_LIMIT: int = 25
     REDDIT_INTERVAL_MINUTES: int = 10
+    # Subreddit listings fetched at once (still paced by SCRAPE_REQUEST_DELAY)
+    REDDIT_MAX_CONCURRENCY: int = 4
 
     # Twitter
     TWITTER_QUERIES: str = "breaking news,AI,technology,crypto"
@@ -28,10 +33,19 @@ class Settings(BaseSettings):
 
     # Scraping behaviour
     SCRAPE_REQUEST_DELAY: float = 2.0
+    # Requests a Reddit or news limiter may send back to back after idling
+    SCRAPE_BURST: int = 3
 
     # Trending
     TREND_WINDOW_HOURS: int = 24
     TREND_MIN_MENTIONS: int = 2
+    # Quiet period after a scrape before trends are recomputed, so scrapes
+    # finishing together share one recompute
+    TREND_DEBOUNCE_SECONDS: float = 5.0
+
+    # API response cache for aggregate endpoints
+    API_CACHE_TTL_SECONDS: float = 5.0
+    API_CACHE_STALE_SECONDS: float = 30.0
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
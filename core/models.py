@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class ScrapedItem:
     """A single piece of content normalised from any source."""
 
@@ -23,7 +23,7 @@ class ScrapedItem:
     extra: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class ScrapeResult:
     """Outcome of a single scraper run."""
 
@@ -95,6 +95,8 @@ function dashboard() {
                     const data = JSON.parse(e.data);
                     if (data.event === 'scrape_complete') {
                         this.fetchAll();
+                    } else if (data.event === 'trends_updated') {
+                        this.fetchTrends();
                     }
                 } catch {}
             };
@@ -1,25 +1,170 @@
 from __future__ import annotations
 
-from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+from collections.abc import AsyncGenerator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from config.settings import settings
-from data.schema import Base
+from data.schema import POSTS_FTS_DDL, Base, DBPost
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
+log = logging.getLogger(__name__)
+
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=False,
+    # Sized for SSE + dashboard polling fan-out; WAL lets readers run
+    # concurrently, so every request can hold its own connection.
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=0,
+    pool_recycle=3600,
+    # Seconds SQLite waits on a locked database before raising
+    connect_args={"timeout": 30},
+)
 async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
 
+# SQLite allows one writer at a time.  Write transactions queue here instead
+# of contending for the database lock.
+_write_lock = asyncio.Lock()
+
+# Set by init_db once the posts_fts index is in place; post search falls
+# back to ILIKE scans without it.
+fts_enabled = False
+
+# Per-connection SQLite tuning.  journal_mode=WAL is persistent and set once
+# in init_db; under WAL, synchronous=NORMAL is still crash-safe but only
+# fsyncs at checkpoints instead of on every commit.
+_SQLITE_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",  # 64 MiB
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+    "PRAGMA wal_autocheckpoint=1000",
+)
+
+if engine.dialect.name == "sqlite":
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+# Statement counter for the current request, installed by count_statements()
+_statement_count: ContextVar[list[int] | None] = ContextVar(
+    "statement_count", default=None
+)
+
+
+def _count_statement(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    counter = _statement_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def enable_statement_counting() -> None:
+    """Count executed statements for callers inside ``count_statements``."""
+    target = engine.sync_engine
+    if not event.contains(target, "before_cursor_execute", _count_statement):
+        event.listen(target, "before_cursor_execute", _count_statement)
+
+
+@contextmanager
+def count_statements() -> Iterator[list[int]]:
+    """Collect the number of statements executed within the block."""
+    counter = [0]
+    token = _statement_count.set(counter)
+    try:
+        yield counter
+    finally:
+        _statement_count.reset(token)
+
+
+def _rebuild_legacy_posts(conn: Connection) -> None:
+    """Rebuild ``posts`` if engagement_score is still a stored column.
+
+    SQLite cannot turn an existing column into a generated one, so the table
+    is recreated from the current schema and the rows copied across.
+    """
+    columns = conn.exec_driver_sql("PRAGMA table_xinfo(posts)").all()
+    # table_xinfo reports hidden=2/3 for generated columns
+    if not columns or any(
+        c[1] == "engagement_score" and c[6] in (2, 3) for c in columns
+    ):
+        return
+
+    conn.exec_driver_sql("ALTER TABLE posts RENAME TO _posts_legacy")
+    indexes = conn.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'index' "
+        "AND tbl_name = '_posts_legacy' AND sql IS NOT NULL"
+    ).scalars().all()
+    for name in indexes:
+        conn.exec_driver_sql(f'DROP INDEX "{name}"')
+    DBPost.__table__.create(conn)
+    names = ", ".join(
+        c.name for c in DBPost.__table__.columns if c.computed is None
+    )
+    conn.exec_driver_sql(
+        f"INSERT INTO posts ({names}) SELECT {names} FROM _posts_legacy"
+    )
+    conn.exec_driver_sql("DROP TABLE _posts_legacy")
+
+
+# Single-column indexes superseded by the composites that lead with the
+# same column; they only cost extra writes on every upsert
+_RETIRED_INDEXES = ("ix_posts_source", "ix_posts_published_at")
+
+
+def _create_missing_indexes(conn: Connection) -> None:
+    """Bring indexes on existing tables in line with the declared schema.
+
+    ``create_all`` skips tables that already exist, indexes included.
+    """
+    for name in _RETIRED_INDEXES:
+        conn.exec_driver_sql(f'DROP INDEX IF EXISTS "{name}"')
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
 
 async def init_db() -> None:
     """Create all tables (idempotent)."""
     async with engine.begin() as conn:
+        await conn.run_sync(_rebuild_legacy_posts)
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_create_missing_indexes)
         # Enable WAL mode for better concurrent read/write performance
-        await conn.execute(
-            __import__("sqlalchemy").text("PRAGMA journal_mode=WAL")
-        )
+        await conn.execute(text("PRAGMA journal_mode=WAL"))
+
+    global fts_enabled
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(_create_posts_fts)
+    except OperationalError as e:
+        log.warning("Full-text search unavailable, using LIKE scans: %s", e)
+    else:
+        fts_enabled = True
+
+
+def _create_posts_fts(conn: Connection) -> None:
+    exists = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE name = 'posts_fts'"
+    ).first()
+    for statement in POSTS_FTS_DDL:
+        conn.exec_driver_sql(statement)
+    if not exists:
+        # Index the rows that were there before the FTS table
+        conn.exec_driver_sql("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')")
 
 
 @asynccontextmanager
@@ -31,3 +176,11 @@ async def get_session() -> AsyncGenerator[AsyncSession]:
         except Exception:
             await session.rollback()
             raise
+
+
+@asynccontextmanager
+async def get_write_session() -> AsyncGenerator[AsyncSession]:
+    """Like ``get_session``, but holds the process-wide writer lock."""
+    async with _write_lock:
+        async with get_session() as session:
+            yield session
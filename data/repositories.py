@@ -2,15 +2,29 @@ from __future__ import annotations
 
 import re
 from collections import Counter
+from collections.abc import Sequence
 from datetime import datetime, timedelta, timezone
-
-from sqlalchemy import Integer, delete, func, select, update
+from itertools import filterfalse
+
+from sqlalchemy import (
+    Float,
+    Integer,
+    case,
+    cast,
+    delete,
+    func,
+    select,
+    tuple_,
+    update,
+)
 from sqlalchemy.dialects.sqlite import insert as sqlite_upsert
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config.settings import settings
 from core.models import ScrapedItem
-from data.schema import DBPost, DBScrapeRun, DBTrendingTopic
+from data import database
+from data.schema import DBPost, DBScrapeRun, DBTrendingTopic, posts_fts
 
 # ── helpers ──────────────────────────────────────────────────────────
 
@@ -25,17 +39,45 @@ _STOP_WORDS = frozenset(
     "here there these those am i me we they them he she you".split()
 )
 
-_WORD_RE = re.compile(r"[a-zA-Z]{3,}")
-
-
-def _compute_engagement(score: int, num_comments: int) -> float:
-    return score + num_comments * 2.0
+# Keywords are runs of four or more letters
+_WORD_RE = re.compile(r"[a-zA-Z]{4,}")
+_is_stop_word = _STOP_WORDS.__contains__
 
 
 def _extract_keywords(text: str) -> list[str]:
     """Pull meaningful keywords from a title/body for trend detection."""
-    words = _WORD_RE.findall(text.lower())
-    return [w for w in words if w not in _STOP_WORDS and len(w) > 3]
+    return list(filterfalse(_is_stop_word, _WORD_RE.findall(text.lower())))
+
+
+def _fts_query(search: str) -> str:
+    """Turn free text into an FTS5 query: every word, as a quoted prefix."""
+    return " ".join(
+        '"{}"*'.format(word.replace('"', '""')) for word in search.split()
+    )
+
+
+# SQLite hands a virtual REAL column back as an integer when the plan sorts
+# through a temp B-tree, so it is always read through an explicit cast.
+_ENGAGEMENT = cast(DBPost.engagement_score, Float)
+
+# Columns served by the post feed; the body preview is cut in SQL so the
+# full text never leaves the database.
+_POST_LIST_COLS = (
+    DBPost.id,
+    DBPost.source,
+    DBPost.source_id,
+    DBPost.source_url,
+    DBPost.author,
+    DBPost.title,
+    func.substr(DBPost.body, 1, 300).label("body"),
+    DBPost.subreddit,
+    DBPost.category,
+    DBPost.score,
+    DBPost.num_comments,
+    _ENGAGEMENT.label("engagement_score"),
+    DBPost.published_at,
+    DBPost.scraped_at,
+)
 
 
 # ── PostRepository ───────────────────────────────────────────────────
@@ -46,45 +88,53 @@ class PostRepository:
         self._s = session
 
     async def upsert_many(self, items: list[ScrapedItem]) -> int:
-        """Insert or ignore scraped items. Returns count of newly inserted rows."""
+        """Insert or update scraped items. Returns count of newly inserted rows."""
         if not items:
             return 0
 
-        new_count = 0
-        for item in items:
-            stmt = (
-                sqlite_upsert(DBPost)
-                .values(
-                    source=item.source,
-                    source_id=item.source_id,
-                    source_url=item.source_url,
-                    author=item.author,
-                    title=item.title,
-                    body=item.body[:2000],
-                    subreddit=item.subreddit,
-                    category=item.category,
-                    score=item.score,
-                    num_comments=item.num_comments,
-                    engagement_score=_compute_engagement(item.score, item.num_comments),
-                    published_at=item.published_at,
-                    scraped_at=datetime.now(timezone.utc),
-                )
-                .on_conflict_do_update(
-                    index_elements=["source", "source_id"],
-                    set_={
-                        "score": item.score,
-                        "num_comments": item.num_comments,
-                        "engagement_score": _compute_engagement(
-                            item.score, item.num_comments
-                        ),
-                        "scraped_at": datetime.now(timezone.utc),
-                    },
+        now = datetime.now(timezone.utc)
+        # Keyed on the conflict target so an item seen twice in one batch
+        # (the later copy wins) costs a single row in the statement
+        rows = {
+            (item.source, item.source_id): {
+                "source": item.source,
+                "source_id": item.source_id,
+                "source_url": item.source_url,
+                "author": item.author,
+                "title": item.title,
+                "body": item.body[:2000],
+                "subreddit": item.subreddit,
+                "category": item.category,
+                "score": item.score,
+                "num_comments": item.num_comments,
+                "published_at": item.published_at,
+                "scraped_at": now,
+            }
+            for item in items
+        }
+
+        # The upsert reports one affected row per item whether it inserted or
+        # updated, so count the keys that already exist beforehand instead.
+        existing = (
+            await self._s.scalar(
+                select(func.count(DBPost.id)).where(
+                    tuple_(DBPost.source, DBPost.source_id).in_(list(rows))
                 )
             )
-            result = await self._s.execute(stmt)
-            if result.rowcount and result.rowcount > 0:
-                new_count += 1
-        return new_count
+            or 0
+        )
+
+        stmt = sqlite_upsert(DBPost).values(list(rows.values()))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["source", "source_id"],
+            set_={
+                "score": stmt.excluded.score,
+                "num_comments": stmt.excluded.num_comments,
+                "scraped_at": stmt.excluded.scraped_at,
+            },
+        )
+        await self._s.execute(stmt)
+        return len(rows) - existing
 
     async def list_posts(
         self,
@@ -97,13 +147,11 @@ class PostRepository:
         limit: int = 50,
         offset: int = 0,
         since: datetime | None = None,
-    ) -> list[DBPost]:
-        q = select(DBPost)
+    ) -> Sequence[RowMapping]:
+        q = select(*_POST_LIST_COLS)
+        search = search.strip() if search else None
         if source:
             q = q.where(DBPost.source == source)
-        if search:
-            pattern = f"%{search}%"
-            q = q.where(DBPost.title.ilike(pattern) | DBPost.body.ilike(pattern))
         if subreddit:
             q = q.where(DBPost.subreddit == subreddit)
         if since:
@@ -111,41 +159,57 @@ class PostRepository:
 
         sort_col = getattr(DBPost, sort, DBPost.published_at)
         q = q.order_by(sort_col.desc() if order == "desc" else sort_col.asc())
-        q = q.limit(limit).offset(offset)
-        result = await self._s.execute(q)
-        return list(result.scalars().all())
+
+        if search and database.fts_enabled:
+            matched = q.join(posts_fts, posts_fts.c.rowid == DBPost.id).where(
+                posts_fts.c.posts_fts.match(_fts_query(search))
+            )
+            result = await self._s.execute(matched.limit(limit).offset(offset))
+            rows = result.mappings().all()
+            # FTS only matches whole words by prefix. When it finds nothing
+            # at all, fall back to the substring scan so a term from inside
+            # a word ("script" in "JavaScript") still matches.
+            if rows or (
+                offset and await self._s.scalar(select(matched.order_by(None).exists()))
+            ):
+                return rows
+        if search:
+            pattern = f"%{search}%"
+            q = q.where(DBPost.title.ilike(pattern) | DBPost.body.ilike(pattern))
+
+        result = await self._s.execute(q.limit(limit).offset(offset))
+        return result.mappings().all()
 
     async def get_stats(self) -> dict:
         now = datetime.now(timezone.utc)
         today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
-        total = await self._s.scalar(select(func.count(DBPost.id))) or 0
-        today = (
-            await self._s.scalar(
-                select(func.count(DBPost.id)).where(
-                    DBPost.scraped_at >= today_start
-                )
-            )
-            or 0
-        )
-        avg_eng = (
-            await self._s.scalar(select(func.avg(DBPost.engagement_score))) or 0.0
-        )
-
-        # Per-source breakdown
-        per_source_q = select(
-            DBPost.source, func.count(DBPost.id), func.avg(DBPost.engagement_score)
+        # One grouped scan; the overall figures are rolled up from the
+        # per-source rows rather than queried separately.
+        q = select(
+            DBPost.source,
+            func.count(DBPost.id),
+            func.sum(case((DBPost.scraped_at >= today_start, 1), else_=0)),
+            func.sum(_ENGAGEMENT),
         ).group_by(DBPost.source)
-        rows = (await self._s.execute(per_source_q)).all()
-        per_source = {
-            row[0]: {"count": row[1], "avg_engagement": round(row[2] or 0, 1)}
-            for row in rows
-        }
+        rows = (await self._s.execute(q)).all()
+
+        total = today = 0
+        eng_total = 0.0
+        per_source = {}
+        for source, count, today_count, eng_sum in rows:
+            total += count
+            today += today_count or 0
+            eng_total += eng_sum or 0.0
+            per_source[source] = {
+                "count": count,
+                "avg_engagement": round((eng_sum or 0.0) / count, 1),
+            }
 
         return {
             "total_posts": total,
             "posts_today": today,
-            "avg_engagement": round(avg_eng, 1),
+            "avg_engagement": round(eng_total / total, 1) if total else 0.0,
             "per_source": per_source,
         }
 
@@ -179,67 +243,77 @@ class TrendRepository:
 
     async def compute_trends(self) -> None:
         """Recompute trending topics from recent posts."""
-        since = datetime.now(timezone.utc) - timedelta(
-            hours=settings.TREND_WINDOW_HOURS
-        )
-        q = select(DBPost.source, DBPost.title, DBPost.engagement_score).where(
+        now = datetime.now(timezone.utc)
+        since = now - timedelta(hours=settings.TREND_WINDOW_HOURS)
+        q = select(DBPost.source, DBPost.title, _ENGAGEMENT).where(
             DBPost.published_at >= since
         )
         rows = (await self._s.execute(q)).all()
 
-        # Count keyword frequencies per source
+        # Count keyword frequencies per source, with a running engagement
+        # total per keyword (the counter already holds the matching count)
         source_counters: dict[str, Counter[str]] = {}
-        source_engagement: dict[str, dict[str, list[float]]] = {}
+        source_engagement: dict[str, dict[str, float]] = {}
         for source, title, eng in rows:
             if source not in source_counters:
                 source_counters[source] = Counter()
                 source_engagement[source] = {}
             keywords = _extract_keywords(title)
             source_counters[source].update(keywords)
+            totals = source_engagement[source]
             for kw in keywords:
-                source_engagement[source].setdefault(kw, []).append(eng)
-
-        # Mark all existing as inactive, then upsert active ones
-        await self._s.execute(
-            update(DBTrendingTopic).values(is_active=False)
-        )
+                totals[kw] = totals.get(kw, 0.0) + eng
 
-        now = datetime.now(timezone.utc)
+        upsert_rows: list[dict] = []
         for source, counter in source_counters.items():
             for topic, count in counter.most_common(20):
                 if count < settings.TREND_MIN_MENTIONS:
                     continue
-                eng_values = source_engagement[source][topic]
-                avg_eng = sum(eng_values) / len(eng_values) if eng_values else 0
-
-                stmt = (
-                    sqlite_upsert(DBTrendingTopic)
-                    .values(
-                        source=source,
-                        topic=topic,
-                        mention_count=count,
-                        avg_engagement=round(avg_eng, 1),
-                        first_seen=now,
-                        last_seen=now,
-                        is_active=True,
-                    )
-                    .on_conflict_do_update(
-                        index_elements=["source", "topic"],
-                        set_={
-                            "mention_count": count,
-                            "avg_engagement": round(avg_eng, 1),
-                            "last_seen": now,
-                            "is_active": True,
-                        },
-                    )
+                avg_eng = source_engagement[source][topic] / count
+                upsert_rows.append(
+                    {
+                        "source": source,
+                        "topic": topic,
+                        "mention_count": count,
+                        "avg_engagement": round(avg_eng, 1),
+                        "first_seen": now,
+                        "last_seen": now,
+                        "is_active": True,
+                    }
                 )
-                await self._s.execute(stmt)
+
+        # Mark all existing as inactive, then upsert active ones
+        await self._s.execute(
+            update(DBTrendingTopic).values(is_active=False)
+        )
+        if not upsert_rows:
+            return
+
+        stmt = sqlite_upsert(DBTrendingTopic).values(upsert_rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["source", "topic"],
+            set_={
+                "mention_count": stmt.excluded.mention_count,
+                "avg_engagement": stmt.excluded.avg_engagement,
+                "last_seen": stmt.excluded.last_seen,
+                "is_active": True,
+            },
+        )
+        await self._s.execute(stmt)
 
     async def list_trends(
         self, *, source: str | None = None, limit: int = 30
-    ) -> list[DBTrendingTopic]:
+    ) -> Sequence[RowMapping]:
         q = (
-            select(DBTrendingTopic)
+            select(
+                DBTrendingTopic.id,
+                DBTrendingTopic.source,
+                DBTrendingTopic.topic,
+                DBTrendingTopic.mention_count,
+                DBTrendingTopic.avg_engagement,
+                DBTrendingTopic.first_seen,
+                DBTrendingTopic.last_seen,
+            )
             .where(DBTrendingTopic.is_active.is_(True))
             .order_by(DBTrendingTopic.mention_count.desc())
             .limit(limit)
@@ -247,27 +321,24 @@ class TrendRepository:
         if source:
             q = q.where(DBTrendingTopic.source == source)
         result = await self._s.execute(q)
-        return list(result.scalars().all())
+        return result.mappings().all()
 
     async def get_timeline(self, hours: int = 24) -> list[dict]:
         """Trend mention counts over time for charting."""
         since = datetime.now(timezone.utc) - timedelta(hours=hours)
         q = (
-            select(DBTrendingTopic)
+            select(
+                DBTrendingTopic.topic,
+                DBTrendingTopic.source,
+                DBTrendingTopic.mention_count,
+                DBTrendingTopic.avg_engagement,
+            )
             .where(DBTrendingTopic.last_seen >= since, DBTrendingTopic.is_active.is_(True))
             .order_by(DBTrendingTopic.mention_count.desc())
             .limit(20)
         )
         result = await self._s.execute(q)
-        return [
-            {
-                "topic": t.topic,
-                "source": t.source,
-                "mention_count": t.mention_count,
-                "avg_engagement": t.avg_engagement,
-            }
-            for t in result.scalars().all()
-        ]
+        return [dict(m) for m in result.mappings()]
 
 
 # ── ScrapeLogRepository ──────────────────────────────────────────────
@@ -300,14 +371,14 @@ class ScrapeLogRepository:
         )
         self._s.add(run)
 
-    async def recent_runs(self, limit: int = 20) -> list[DBScrapeRun]:
+    async def recent_runs(self, limit: int = 20) -> Sequence[RowMapping]:
         q = (
-            select(DBScrapeRun)
+            select(DBScrapeRun.__table__)
             .order_by(DBScrapeRun.started_at.desc())
             .limit(limit)
         )
         result = await self._s.execute(q)
-        return list(result.scalars().all())
+        return result.mappings().all()
 
     async def source_stats(self) -> list[dict]:
         """Per-source: last run time, total runs, success rate."""
@@ -330,7 +401,7 @@ class ScrapeLogRepository:
                 "source": r[0],
                 "total_runs": r[1],
                 "success_rate": round((r[2] or 0) / max(r[1], 1) * 100, 0),
-                "last_run": r[3].isoformat() if r[3] else None,
+                "last_run": r[3],
                 "total_items": r[4] or 0,
             }
             for r in rows
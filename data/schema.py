@@ -2,7 +2,18 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Float, Index, Integer, String, Text
+from sqlalchemy import (
+    Boolean,
+    Computed,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    column,
+    table,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -14,7 +25,7 @@ class DBPost(Base):
     __tablename__ = "posts"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    source: Mapped[str] = mapped_column(String(20), index=True)
+    source: Mapped[str] = mapped_column(String(20))
     source_id: Mapped[str] = mapped_column(String(256))
     source_url: Mapped[str] = mapped_column(Text, default="")
     author: Mapped[str] = mapped_column(String(256), default="")
@@ -24,15 +35,45 @@ class DBPost(Base):
     category: Mapped[str] = mapped_column(String(100), default="")
     score: Mapped[int] = mapped_column(Integer, default=0)
     num_comments: Mapped[int] = mapped_column(Integer, default=0)
-    engagement_score: Mapped[float] = mapped_column(Float, default=0.0)
-    published_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+    engagement_score: Mapped[float] = mapped_column(
+        Float, Computed("score + num_comments * 2.0", persisted=False)
+    )
+    published_at: Mapped[datetime] = mapped_column(DateTime)
     scraped_at: Mapped[datetime] = mapped_column(DateTime)
 
     __table_args__ = (
         Index("ix_posts_source_source_id", "source", "source_id", unique=True),
+        # Composite indexes matching the list/filter/aggregate query shapes;
+        # they also cover lookups on source or published_at alone
+        Index("ix_posts_source_pub", "source", "published_at"),
+        Index("ix_posts_subreddit_pub", "subreddit", "published_at"),
+        Index("ix_posts_pub_source", "published_at", "source"),
     )
 
 
+# Full-text index over post titles and bodies, kept in sync by triggers.
+# SQLAlchemy cannot declare FTS5 virtual tables, so init_db applies this DDL
+# and queries go through the lightweight ``posts_fts`` construct below.
+POSTS_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5("
+    "title, body, content='posts', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN "
+    "INSERT INTO posts_fts(rowid, title, body) "
+    "VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE OF title, body "
+    "ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO posts_fts(rowid, title, body) "
+    "VALUES (new.id, new.title, new.body); END",
+)
+
+posts_fts = table("posts_fts", column("rowid", Integer), column("posts_fts"))
+
+
 class DBTrendingTopic(Base):
     __tablename__ = "trending_topics"
 
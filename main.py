@@ -2,21 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-import os
 
-import certifi
 import uvicorn
 
-# Fix SSL cert resolution for curl_cffi (used by Scrapling)
-os.environ.setdefault("CURL_CA_BUNDLE", certifi.where())
-os.environ.setdefault("SSL_CERT_FILE", certifi.where())
-
-from api.app import create_app  # noqa: E402
-from api.routers.scraper_control import set_scheduler  # noqa: E402
-from config.settings import settings  # noqa: E402
-from data.database import init_db  # noqa: E402
-from scrapers.scheduler import ScrapeScheduler  # noqa: E402
+from api.app import create_app
+from api.routers.scraper_control import set_scheduler
+from config.settings import settings
+from data.database import init_db
+from scrapers.scheduler import ScrapeScheduler
 
 logging.basicConfig(
     level=getattr(logging, settings.LOG_LEVEL),
@@ -29,6 +24,9 @@ app = create_app()
 
 @app.on_event("startup")
 async def on_startup() -> None:
+    loop = asyncio.get_running_loop()
+    log.info("Event loop: %s.%s", type(loop).__module__, type(loop).__qualname__)
+
     log.info("Initialising database…")
     await init_db()
 
@@ -42,7 +40,7 @@ async def on_startup() -> None:
 @app.on_event("shutdown")
 async def on_shutdown() -> None:
     if hasattr(app.state, "scheduler"):
-        app.state.scheduler.stop()
+        await app.state.scheduler.stop()
         log.info("Scrape scheduler stopped.")
 
 
@@ -52,4 +50,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=settings.DASHBOARD_PORT,
         reload=False,
+        # "auto" runs on uvloop wherever it is installed (uvicorn[standard]
+        # ships it on Linux and macOS) and falls back to asyncio elsewhere
+        loop="auto",
     )
@@ -1,9 +1,49 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import logging
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Iterable
 
-from core.models import ScrapeResult
+import httpx
+
+from core.models import ScrapedItem, ScrapeResult
+
+log = logging.getLogger(__name__)
+
+# Browser-like request headers for the HTML sources
+BROWSER_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """HTTP client shared by the scrapers so connections survive between runs."""
+    return httpx.AsyncClient(
+        http2=True,
+        follow_redirects=True,
+        timeout=30.0,
+        limits=httpx.Limits(max_keepalive_connections=32),
+    )
+
+
+def stable_id(key: str) -> str:
+    """16-hex-char id for sources without one of their own.
+
+    Stays MD5 so ids already stored keep deduplicating; it is not used for
+    security, which also spares the FIPS check on each call.
+    """
+    return hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()[:16]
+
+
+# A zero-argument fetch of one page or listing, awaited by _collect
+Fetch = Callable[[], Awaitable[list[ScrapedItem]]]
 
 
 class BaseScraper(ABC):
@@ -14,19 +54,70 @@ class BaseScraper(ABC):
         """Execute a full scrape cycle."""
         ...
 
+    async def _collect(
+        self, fetches: Iterable[tuple[str, RateLimiter, Fetch]]
+    ) -> tuple[list[ScrapedItem], list[str]]:
+        """Run ``(label, limiter, fetch)`` jobs concurrently and merge them.
+
+        Each fetch waits on its limiter first. A failing fetch becomes an
+        error prefixed with its label instead of sinking the others.
+        """
+        # Keyed on the posts table's unique key, so an item returned by more
+        # than one fetch is only sent to the database once
+        items: dict[tuple[str, str], ScrapedItem] = {}
+        errors: list[str] = []
+        results = await asyncio.gather(
+            *(self._fetch_guarded(*job) for job in fetches)
+        )
+        for new_items, error in results:
+            for item in new_items:
+                items[(item.source, item.source_id)] = item
+            if error:
+                errors.append(error)
+        return list(items.values()), errors
+
+    async def _fetch_guarded(
+        self, label: str, limiter: RateLimiter, fetch: Fetch
+    ) -> tuple[list[ScrapedItem], str | None]:
+        try:
+            await limiter.wait()
+            new_items = await fetch()
+        except Exception as e:
+            msg = f"{label}: {e}"
+            log.warning("%s scrape error: %s", self.source_name, msg)
+            return [], msg
+        log.info("Scraped %s: %d items", label, len(new_items))
+        return new_items, None
+
 
 class RateLimiter:
-    """Simple token-bucket style rate limiter."""
+    """Token-bucket rate limiter.
+
+    Tokens refill at one per ``delay_seconds`` and accumulate up to
+    ``burst``, so a limiter that has sat idle lets ``burst`` requests
+    through back to back before spacing the rest out.
+    """
 
-    def __init__(self, delay_seconds: float = 2.0) -> None:
+    def __init__(self, delay_seconds: float = 2.0, burst: int = 1) -> None:
         self._delay = delay_seconds
+        self._capacity = float(max(burst, 1))
+        self._tokens = self._capacity
+        self._updated: float = 0.0
         self._lock = asyncio.Lock()
-        self._last_request: float = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) / self._delay
+        )
+        self._updated = now
 
     async def wait(self) -> None:
+        if self._delay <= 0:
+            return
         async with self._lock:
-            now = asyncio.get_event_loop().time()
-            elapsed = now - self._last_request
-            if elapsed < self._delay:
-                await asyncio.sleep(self._delay - elapsed)
-            self._last_request = asyncio.get_event_loop().time()
+            loop = asyncio.get_running_loop()
+            self._refill(loop.time())
+            if self._tokens < 1.0:
+                await asyncio.sleep((1.0 - self._tokens) * self._delay)
+                self._refill(loop.time())
+            self._tokens -= 1.0
@@ -2,77 +2,75 @@
 
 from __future__ import annotations
 
-import logging
+import asyncio
 import time
 from datetime import datetime, timezone
+from functools import partial
 
 import httpx
+import msgspec
 
 from config.settings import settings
 from core.models import ScrapedItem, ScrapeResult
 from scrapers.base import BaseScraper, RateLimiter
 
-log = logging.getLogger(__name__)
+
+class _RedditPost(msgspec.Struct):
+    """The fields of a listing entry that we keep; the rest are skipped."""
+
+    id: str = ""
+    title: str = ""
+    permalink: str = ""
+    author: str | None = None
+    selftext: str = ""
+    score: int = 0
+    num_comments: int = 0
+    created_utc: float | None = None
+
+
+class _RedditChild(msgspec.Struct):
+    data: _RedditPost
+
+
+class _RedditListingData(msgspec.Struct):
+    children: list[_RedditChild] = []
+
+
+class _RedditListing(msgspec.Struct):
+    data: _RedditListingData
+
+
+# Typed decoding builds only the declared fields instead of a dict for
+# each of the ~100 keys Reddit sends per post
+_decode_listing = msgspec.json.Decoder(_RedditListing).decode
+
+# Reddit asks API clients to identify themselves rather than pose as browsers
+REDDIT_HEADERS = {
+    "User-Agent": "SocialDashboard/1.0 (research project; github.com)",
+}
 
 
 class RedditScraper(BaseScraper):
     source_name = "reddit"
 
-    def __init__(self) -> None:
-        self._limiter = RateLimiter(delay_seconds=settings.SCRAPE_REQUEST_DELAY)
+    def __init__(self, client: httpx.AsyncClient) -> None:
+        self._client = client
+        self._limiter = RateLimiter(
+            delay_seconds=settings.SCRAPE_REQUEST_DELAY, burst=settings.SCRAPE_BURST
+        )
+        # Caps requests in flight; the limiter still spaces out their starts
+        self._in_flight = asyncio.Semaphore(settings.REDDIT_MAX_CONCURRENCY)
 
     async def scrape(self) -> ScrapeResult:
-        items: list[ScrapedItem] = []
-        errors: list[str] = []
         t0 = time.monotonic()
 
         subreddits = [s.strip() for s in settings.REDDIT_SUBREDDITS.split(",") if s.strip()]
 
-        async with httpx.AsyncClient(
-            headers={
-                "User-Agent": "SocialDashboard/1.0 (research project; github.com)",
-            },
-            follow_redirects=True,
-            timeout=30.0,
-        ) as client:
-            for sub in subreddits:
-                await self._limiter.wait()
-                try:
-                    url = (
-                        f"https://www.reddit.com/r/{sub}/{settings.REDDIT_SORT}.json"
-                        f"?limit={settings.REDDIT_LIMIT}&raw_json=1"
-                    )
-                    resp = await client.get(url)
-                    resp.raise_for_status()
-                    data = resp.json()
-
-                    for child in data.get("data", {}).get("children", []):
-                        post = child.get("data", {})
-                        if not post.get("title"):
-                            continue
-
-                        items.append(
-                            ScrapedItem(
-                                source="reddit",
-                                source_id=post.get("id", ""),
-                                source_url=f"https://www.reddit.com{post.get('permalink', '')}",
-                                author=post.get("author", "[deleted]"),
-                                title=post.get("title", ""),
-                                body=post.get("selftext", "")[:2000],
-                                score=post.get("score", 0),
-                                num_comments=post.get("num_comments", 0),
-                                published_at=datetime.fromtimestamp(
-                                    post.get("created_utc", 0), tz=timezone.utc
-                                ),
-                                subreddit=sub,
-                            )
-                        )
-                    log.info("r/%s: %d posts fetched (status %d)", sub, len(data.get("data", {}).get("children", [])), resp.status_code)
-
-                except Exception as exc:
-                    msg = f"r/{sub}: {exc}"
-                    log.warning(msg)
-                    errors.append(msg)
+        # Requests share the client's HTTP/2 connection to www.reddit.com
+        items, errors = await self._collect(
+            (f"r/{sub}", self._limiter, partial(self._fetch_subreddit, sub))
+            for sub in subreddits
+        )
 
         elapsed = time.monotonic() - t0
         return ScrapeResult(
@@ -81,3 +79,40 @@ class RedditScraper(BaseScraper):
             errors=errors,
             duration_seconds=elapsed,
         )
+
+    async def _fetch_subreddit(self, sub: str) -> list[ScrapedItem]:
+        url = (
+            f"https://www.reddit.com/r/{sub}/{settings.REDDIT_SORT}.json"
+            f"?limit={settings.REDDIT_LIMIT}&raw_json=1"
+        )
+        async with self._in_flight:
+            resp = await self._client.get(url, headers=REDDIT_HEADERS)
+        resp.raise_for_status()
+        children = _decode_listing(resp.content).data.children
+
+        items: list[ScrapedItem] = []
+        now = datetime.now(timezone.utc)
+        for child in children:
+            post = child.data
+            if not post.title:
+                continue
+
+            items.append(
+                ScrapedItem(
+                    source="reddit",
+                    source_id=post.id,
+                    source_url=f"https://www.reddit.com{post.permalink}",
+                    author=post.author or "[deleted]",
+                    title=post.title,
+                    body=post.selftext[:2000],
+                    score=post.score,
+                    num_comments=post.num_comments,
+                    published_at=(
+                        datetime.fromtimestamp(post.created_utc, tz=timezone.utc)
+                        if post.created_utc
+                        else now
+                    ),
+                    subreddit=sub,
+                )
+            )
+        return items
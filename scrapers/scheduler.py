@@ -1,21 +1,26 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import datetime, timezone
+import time
+from datetime import datetime, timedelta, timezone
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from config.settings import settings
 from core.models import ScrapeResult
-from data.database import get_session
+from data.database import get_write_session
 from data.repositories import PostRepository, ScrapeLogRepository, TrendRepository
-from scrapers.base import BaseScraper
+from scrapers.base import BaseScraper, create_http_client
 from scrapers.news import NewsScraper
 from scrapers.reddit import RedditScraper
 from scrapers.twitter import TwitterScraper
 
 log = logging.getLogger(__name__)
 
+# Ticks fire a hair late, so a source counts as due slightly early
+_DUE_SLACK = timedelta(seconds=30)
+
 
 class ScrapeScheduler:
     """Orchestrates periodic scraping and persistence."""
@@ -23,115 +28,184 @@ class ScrapeScheduler:
     def __init__(self, broadcast_fn=None) -> None:
         self._broadcast = broadcast_fn
         self._scheduler = AsyncIOScheduler()
+        # One keep-alive client for every scraper, reused across runs
+        self._http = create_http_client()
         self._scrapers: dict[str, BaseScraper] = {
-            "reddit": RedditScraper(),
-            "news": NewsScraper(),
-            "twitter": TwitterScraper(),
+            "reddit": RedditScraper(self._http),
+            "news": NewsScraper(self._http),
+            "twitter": TwitterScraper(self._http),
         }
-
-    def start(self) -> None:
-        intervals = {
+        # Set after each persisted scrape; drained by _trend_worker
+        self._trend_pending = asyncio.Event()
+        self._trend_task: asyncio.Task | None = None
+        self._intervals = {
             "reddit": settings.REDDIT_INTERVAL_MINUTES,
             "news": settings.NEWS_INTERVAL_MINUTES,
             "twitter": settings.TWITTER_INTERVAL_MINUTES,
         }
-        for name, scraper in self._scrapers.items():
-            minutes = intervals.get(name, 15)
-            self._scheduler.add_job(
-                self._run_scraper,
-                "interval",
-                minutes=minutes,
-                args=[scraper],
-                id=f"scrape_{name}",
-                replace_existing=True,
-            )
-            # Also run once at startup (after a short delay to let server boot)
-            self._scheduler.add_job(
-                self._run_scraper,
-                "date",
-                run_date=datetime.now(timezone.utc),
-                args=[scraper],
-                id=f"scrape_{name}_init",
-            )
+        # When each source last started a scheduled scrape
+        self._last_run: dict[str, datetime] = {}
+
+    def start(self) -> None:
+        # A single once-a-minute tick scrapes whichever sources are due, so
+        # sources whose intervals line up run side by side and share one
+        # write. The first tick fires immediately to fill the dashboard.
+        self._scheduler.add_job(
+            self._run_due_scrapers,
+            "interval",
+            minutes=1,
+            next_run_time=datetime.now(timezone.utc),
+            # A slow source may still be running when the next tick fires;
+            # it is not due again, so overlapping ticks never repeat it
+            max_instances=3,
+            id="scrape_tick",
+            replace_existing=True,
+        )
         self._scheduler.start()
-        log.info("Scrape scheduler started with intervals: %s", intervals)
+        self._trend_task = asyncio.create_task(self._trend_worker())
+        log.info("Scrape scheduler started with intervals: %s", self._intervals)
 
-    def stop(self) -> None:
+    async def stop(self) -> None:
         self._scheduler.shutdown(wait=False)
+        if self._trend_task:
+            self._trend_task.cancel()
+        await self._http.aclose()
 
     async def run_source(self, source: str) -> ScrapeResult | None:
         """Manually trigger a single source scrape."""
         scraper = self._scrapers.get(source)
         if not scraper:
             return None
-        return await self._run_scraper(scraper)
+        results = await self._run_scrapers([scraper])
+        return results[0]
 
     def get_status(self) -> dict:
         jobs = []
-        for job in self._scheduler.get_jobs():
+        for name in self._scrapers:
+            last_run = self._last_run.get(name)
+            next_run = (
+                last_run + timedelta(minutes=self._intervals.get(name, 15))
+                if last_run
+                else None
+            )
             jobs.append(
                 {
-                    "id": job.id,
-                    "next_run": job.next_run_time.isoformat()
-                    if job.next_run_time
-                    else None,
+                    "id": f"scrape_{name}",
+                    "next_run": next_run.isoformat() if next_run else None,
                 }
             )
         return {"running": self._scheduler.running, "jobs": jobs}
 
-    async def _run_scraper(self, scraper: BaseScraper) -> ScrapeResult:
+    async def _run_due_scrapers(self) -> None:
+        now = datetime.now(timezone.utc)
+        due = [
+            scraper
+            for name, scraper in self._scrapers.items()
+            if name not in self._last_run
+            or now - self._last_run[name]
+            >= timedelta(minutes=self._intervals.get(name, 15)) - _DUE_SLACK
+        ]
+        if not due:
+            return
+        for scraper in due:
+            self._last_run[scraper.source_name] = now
+        await self._run_scrapers(due)
+
+    async def _run_scrapers(self, scrapers: list[BaseScraper]) -> list[ScrapeResult]:
         started_at = datetime.now(timezone.utc)
-        log.info("Starting scrape: %s", scraper.source_name)
+        log.info("Starting scrape: %s", ", ".join(s.source_name for s in scrapers))
 
-        result = await scraper.scrape()
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(self._scrape(scraper)) for scraper in scrapers]
+        results = [task.result() for task in tasks]
 
-        # Persist results
-        new_count = 0
+        # Persist every result in one transaction
+        new_counts = dict.fromkeys((r.source for r in results), 0)
         try:
-            async with get_session() as session:
+            async with get_write_session() as session:
                 post_repo = PostRepository(session)
-                new_count = await post_repo.upsert_many(result.items)
-
-                # Recompute trends after new data
-                trend_repo = TrendRepository(session)
-                await trend_repo.compute_trends()
-
-                # Log the run
                 log_repo = ScrapeLogRepository(session)
-                status = "success" if not result.errors else "partial"
-                if not result.items and result.errors:
-                    status = "failed"
-                await log_repo.log_run(
-                    source=scraper.source_name,
-                    status=status,
-                    items_scraped=len(result.items),
-                    items_new=new_count,
-                    error_message="; ".join(result.errors)[:500],
-                    duration_seconds=result.duration_seconds,
-                    started_at=started_at,
-                )
+                for result in results:
+                    new_counts[result.source] = await post_repo.upsert_many(
+                        result.items
+                    )
+
+                    # Log the run
+                    status = "success" if not result.errors else "partial"
+                    if not result.items and result.errors:
+                        status = "failed"
+                    await log_repo.log_run(
+                        source=result.source,
+                        status=status,
+                        items_scraped=len(result.items),
+                        items_new=new_counts[result.source],
+                        error_message="; ".join(result.errors)[:500],
+                        duration_seconds=result.duration_seconds,
+                        started_at=started_at,
+                    )
+            # Trends are recomputed once the current burst of scrapes settles
+            self._trend_pending.set()
         except Exception as e:
-            log.error("Failed to persist scrape results for %s: %s", scraper.source_name, e)
-
-        log.info(
-            "Finished scrape: %s | %d items (%d new) | %.1fs | %d errors",
-            scraper.source_name,
-            len(result.items),
-            new_count,
-            result.duration_seconds,
-            len(result.errors),
-        )
+            log.error("Failed to persist scrape results: %s", e)
+            new_counts = dict.fromkeys(new_counts, 0)
+
+        for result in results:
+            new_count = new_counts[result.source]
+            log.info(
+                "Finished scrape: %s | %d items (%d new) | %.1fs | %d errors",
+                result.source,
+                len(result.items),
+                new_count,
+                result.duration_seconds,
+                len(result.errors),
+            )
 
-        # Broadcast SSE event
-        if self._broadcast:
-            await self._broadcast(
-                {
-                    "event": "scrape_complete",
-                    "source": scraper.source_name,
-                    "items": len(result.items),
-                    "new": new_count,
-                    "errors": len(result.errors),
-                }
+            # Broadcast SSE event
+            if self._broadcast:
+                await self._broadcast(
+                    {
+                        "event": "scrape_complete",
+                        "source": result.source,
+                        "items": len(result.items),
+                        "new": new_count,
+                        "errors": len(result.errors),
+                    }
+                )
+
+        return results
+
+    @staticmethod
+    async def _scrape(scraper: BaseScraper) -> ScrapeResult:
+        """Run one scraper, turning a crash into a failed result.
+
+        Scrapers run side by side in a TaskGroup, where an escaping
+        exception would cancel the others mid-fetch.
+        """
+        t0 = time.monotonic()
+        try:
+            return await scraper.scrape()
+        except Exception as e:
+            log.exception("Scrape crashed: %s", scraper.source_name)
+            return ScrapeResult(
+                source=scraper.source_name,
+                items=[],
+                errors=[str(e)],
+                duration_seconds=time.monotonic() - t0,
             )
 
-        return result
+    async def _trend_worker(self) -> None:
+        """Recompute trends at most once per debounce window."""
+        while True:
+            await self._trend_pending.wait()
+            await asyncio.sleep(settings.TREND_DEBOUNCE_SECONDS)
+            # Scrapes that landed during the sleep are covered by this pass
+            self._trend_pending.clear()
+            try:
+                async with get_write_session() as session:
+                    await TrendRepository(session).compute_trends()
+            except Exception as e:
+                log.error("Failed to recompute trends: %s", e)
+                continue
+
+            if self._broadcast:
+                await self._broadcast({"event": "trends_updated"})
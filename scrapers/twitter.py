@@ -1,31 +1,56 @@
 from __future__ import annotations
 
-import asyncio
-import hashlib
 import logging
+import re
 import time
 from datetime import datetime, timezone
+from functools import partial
 from urllib.parse import quote_plus
 
-from scrapling import Fetcher
+import httpx
+import lxml.html
+from lxml import etree
+from lxml.cssselect import CSSSelector
 
 from config.settings import settings
 from core.models import ScrapedItem, ScrapeResult
-from scrapers.base import BaseScraper, RateLimiter
+from scrapers.base import BROWSER_HEADERS, BaseScraper, RateLimiter, stable_id
 
 log = logging.getLogger(__name__)
 
+
+def _first_match(css: str) -> etree.XPath:
+    """Compile *css* to an XPath that yields at most its first match."""
+    return etree.XPath(f"({CSSSelector(css).path})[1]")
+
+
+# Nitter markup, translated to XPath once instead of on every lookup
+_TWEETS = CSSSelector(".timeline-item")
+_USERNAME = _first_match(".username")
+_CONTENT = _first_match(".tweet-content")
+_LINK = _first_match(".tweet-link")
+# Every text node under the stats bar in one pass; each count is its own
+# node, so they never run together the way text_content() would join them
+_STAT_TEXTS = etree.XPath(f"{CSSSelector('.tweet-stats').path}//text()")
+
+# A stat count such as "1,204"; anything else (blank, "1.2K") is skipped
+_COUNT_RE = re.compile(r"\d[\d,]*")
+
+
 class TwitterScraper(BaseScraper):
     """Scrapes Twitter/X content via Nitter instances (public HTML frontends).
 
     Nitter instances can go down, so we rotate through a configured list.
+    An instance that fails is benched for a cooldown that doubles with each
+    consecutive failure, so later queries go straight to a healthy one.
     If all Nitter instances fail for a query, that query is skipped with an
     error logged.
     """
 
     source_name = "twitter"
 
-    def __init__(self) -> None:
+    def __init__(self, client: httpx.AsyncClient) -> None:
+        self._client = client
         self._queries = [
             q.strip() for q in settings.TWITTER_QUERIES.split(",") if q.strip()
         ]
@@ -35,27 +60,17 @@ class TwitterScraper(BaseScraper):
             if u.strip()
         ]
         self._limiter = RateLimiter(max(settings.SCRAPE_REQUEST_DELAY, 3.0))
+        # instance -> (consecutive failures, monotonic time it may be retried)
+        self._instance_state: dict[str, tuple[int, float]] = {}
 
     async def scrape(self) -> ScrapeResult:
-        items: list[ScrapedItem] = []
-        errors: list[str] = []
         start = time.monotonic()
-
-        for query in self._queries:
-            try:
-                await self._limiter.wait()
-                new_items = await asyncio.to_thread(
-                    self._fetch_query, query
-                )
-                items.extend(new_items)
-                log.info(
-                    "Scraped twitter query '%s': %d tweets", query, len(new_items)
-                )
-            except Exception as e:
-                msg = f"twitter/{query}: {e}"
-                log.warning("Twitter scrape error: %s", msg)
-                errors.append(msg)
-
+        # Queries share the Nitter instances, so they also share one limiter:
+        # requests are still spaced out, but their fetches overlap.
+        items, errors = await self._collect(
+            (f"twitter/{query}", self._limiter, partial(self._fetch_query, query))
+            for query in self._queries
+        )
         return ScrapeResult(
             source="twitter",
             items=items,
@@ -63,67 +78,109 @@ class TwitterScraper(BaseScraper):
             duration_seconds=time.monotonic() - start,
         )
 
-    def _fetch_query(self, query: str) -> list[ScrapedItem]:
-        """Try each Nitter instance until one works."""
+    async def _fetch_query(self, query: str) -> list[ScrapedItem]:
+        """Try each available Nitter instance, healthiest first, until one works."""
+        now = time.monotonic()
+        available = sorted(
+            (
+                i
+                for i in self._instances
+                if self._instance_state.get(i, (0, 0.0))[1] <= now
+            ),
+            key=lambda i: self._instance_state.get(i, (0, 0.0))[0],
+        )
+        if not available:
+            raise ConnectionError(
+                f"All Nitter instances are cooling down; skipped '{query}'"
+            )
+
         last_error: Exception | None = None
-        for instance in self._instances:
+        for instance in available:
+            # A concurrent query may have benched it since the list was built
+            if self._benched(instance):
+                continue
             try:
-                return self._scrape_nitter(instance, query)
+                items = await self._scrape_nitter(instance, query)
             except Exception as e:
                 last_error = e
+                self._record_failure(instance)
                 log.debug(
                     "Nitter instance %s failed for '%s': %s",
                     instance, query, e,
                 )
                 continue
+            self._instance_state.pop(instance, None)
+            return items
         raise ConnectionError(
             f"All Nitter instances failed for '{query}': {last_error}"
         )
 
-    def _scrape_nitter(
+    def _benched(self, instance: str) -> bool:
+        return self._instance_state.get(instance, (0, 0.0))[1] > time.monotonic()
+
+    def _record_failure(self, instance: str) -> None:
+        # Queries run concurrently, so several can fail against the same
+        # outage; only the first failure in a cooldown window counts
+        if self._benched(instance):
+            return
+        failures = self._instance_state.get(instance, (0, 0.0))[0] + 1
+        cooldown = min(60 * 2 ** (failures - 1), 3600)
+        self._instance_state[instance] = (failures, time.monotonic() + cooldown)
+
+    async def _scrape_nitter(
         self, instance: str, query: str
     ) -> list[ScrapedItem]:
         url = f"{instance.rstrip('/')}/search?f=tweets&q={quote_plus(query)}"
-        fetcher = Fetcher()
-        page = fetcher.get(url, stealthy_headers=True, follow_redirects=True)
+        resp = await self._client.get(url, headers=BROWSER_HEADERS)
 
-        if page.status != 200:
-            raise ConnectionError(f"HTTP {page.status} from {instance}")
+        if resp.status_code != 200:
+            raise ConnectionError(f"HTTP {resp.status_code} from {instance}")
+        page = lxml.html.fromstring(resp.content)
 
         items: list[ScrapedItem] = []
+        # Tweets are stamped with the fetch time, taken once for the page
+        now = datetime.now(timezone.utc)
         # Nitter uses .timeline-item for each tweet
-        for tweet_el in page.css(".timeline-item"):
+        for tweet_el in _TWEETS(page):
             try:
-                username_el = tweet_el.css(".username")
-                username = username_el[0].text.strip() if username_el else "unknown"
+                username_el = _USERNAME(tweet_el)
+                username = (
+                    username_el[0].text_content().strip() if username_el else "unknown"
+                )
+                # Ids for link-less tweets were always derived from each
+                # element's own leading text (what scrapling's .text gave),
+                # so keep hashing that for ids to match rows already stored
+                id_username = (
+                    (username_el[0].text or "").strip() if username_el else "unknown"
+                )
 
-                content_el = tweet_el.css(".tweet-content")
-                content = content_el[0].text.strip() if content_el else ""
+                content_el = _CONTENT(tweet_el)
+                content = content_el[0].text_content().strip() if content_el else ""
+                id_content = (content_el[0].text or "").strip() if content_el else ""
 
                 if not content:
                     continue
 
                 # Try to get the tweet link for a stable ID
-                link_el = tweet_el.css(".tweet-link")
+                link_el = _LINK(tweet_el)
                 tweet_path = ""
                 if link_el:
-                    tweet_path = link_el[0].attrib.get("href", "")
+                    tweet_path = link_el[0].get("href", "")
 
-                source_id = hashlib.md5(
-                    (tweet_path or f"{username}:{content[:80]}").encode()
-                ).hexdigest()[:16]
+                source_id = stable_id(
+                    tweet_path
+                    or f"{id_username}:{(id_content or content)[:80]}"
+                )
 
                 # Try to extract stats
-                stat_els = tweet_el.css(".tweet-stat .icon-container")
-                comments = 0
-                likes = 0
-                for stat in stat_els:
-                    txt = stat.text.strip().replace(",", "")
-                    if txt.isdigit():
-                        if comments == 0:
-                            comments = int(txt)
-                        else:
-                            likes = int(txt)
+                # Stats run replies, retweets, quotes, likes
+                counts = [
+                    int(m[0].replace(",", ""))
+                    for text in _STAT_TEXTS(tweet_el)
+                    if (m := _COUNT_RE.fullmatch(text.strip()))
+                ]
+                comments = counts[0] if counts else 0
+                likes = counts[-1] if len(counts) > 1 else 0
 
                 items.append(
                     ScrapedItem(
@@ -135,7 +192,7 @@ class TwitterScraper(BaseScraper):
                         body=content,
                         score=likes,
                         num_comments=comments,
-                        published_at=datetime.now(timezone.utc),
+                        published_at=now,
                         category=query,
                     )
                 )